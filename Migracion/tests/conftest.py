@@ -0,0 +1,5 @@
+import os
+import sys
+
+# El migrador es un script suelto, no un paquete: se importa desde Migracion/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from migration_processor_FINAL import (
+    TsvWriter, ValuesLexer, WordPressMigrator, generate_synthetic_dump, iter_tsv_rows, plain_value
+)
+
+# Filas de un INSERT ... VALUES tal como las escriben mysqldump y phpMyAdmin (la
+# segunda columna identifica el caso; la tercera es el valor que se pone a prueba)
+EDGE_ROWS = """(1,'tab escapado','a\\tb'),
+(2,'tab real','a\tb'),
+(3,'NULL',NULL),
+(4,'texto NULL','NULL'),
+(5,'barra N','\\\\N'),
+(6,'barras','C:\\\\fotos\\\\'),
+(7,'comodines','100\\% y a\\_b'),
+(8,'CRLF escapado','l1\\r\\nl2'),
+(9,'CRLF real','l1\r\nl2'),
+(10,'comillas dobladas','it''s'),
+(11,'comilla escapada','it\\'s'),
+(12,'comillas dobles','s:4:\\"file\\";'),
+(13,'multibyte','canción 😀 “x”'),
+(14,'NUL y Z','a\\0b\\Zc'),
+(15,'vacío',''),
+(16,'decimal',1.50),
+(17,'todo','\\t\\\\N\t\r\n''\\%');"""
+
+
+def insert_rows():
+    lexer = ValuesLexer()
+    rows = lexer.feed(EDGE_ROWS)
+    assert lexer.finished
+    return rows
+
+
+def write_tsv(tmp_path, rows):
+    """Escribe las filas con TsvWriter y devuelve (ruta del .tsv, parte del manifiesto)"""
+    os.makedirs(os.path.join(tmp_path, '07_BulkLoad'))
+    writer = TsvWriter(str(tmp_path), '07_BulkLoad', 'edge_migration.sql', 'wp_edge')
+    writer.extend(rows)
+    part, = writer.close()
+    return os.path.join(tmp_path, part['file']), part
+
+
+def load_data_value(value):
+    """Lo que cargaría un INSERT, como texto (LOAD DATA lee todo como texto)"""
+    value = plain_value(value)
+    return None if value is None else str(value)
+
+
+def test_tsv_round_trip_matches_insert_parse(tmp_path):
+    rows = insert_rows()
+    assert len(rows) == 17
+    path, part = write_tsv(tmp_path, rows)
+    assert part['rows'] == len(rows)
+    
+    loaded = list(iter_tsv_rows(path))
+    assert len(loaded) == len(rows)
+    for fields, tsv_fields in zip(rows, loaded):
+        assert tsv_fields == [load_data_value(value) for value in fields], fields[1]
+
+
+@pytest.mark.parametrize('case, expected', [
+    ('tab real', 'a\tb'),
+    ('NULL', None),
+    ('texto NULL', 'NULL'),
+    ('barra N', '\\N'),
+    ('comodines', '100\\% y a\\_b'),
+    ('CRLF real', 'l1\r\nl2'),
+    ('comillas dobladas', "it's"),
+    ('comillas dobles', 's:4:"file";'),
+    ('multibyte', 'canción 😀 “x”'),
+])
+def test_tsv_edge_values(tmp_path, case, expected):
+    path, part = write_tsv(tmp_path, insert_rows())
+    loaded = {fields[1]: fields[2] for fields in iter_tsv_rows(path)}
+    assert loaded[case] == expected
+
+
+def test_tsv_lines_never_contain_raw_line_breaks(tmp_path):
+    path, part = write_tsv(tmp_path, insert_rows())
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert b'\r' not in data
+    assert data.count(b'\n') == part['rows']
+
+
+def test_synthetic_dump_tsv_and_insert_outputs_are_identical(tmp_path):
+    dump = os.path.join(tmp_path, 'synthetic.sql')
+    generate_synthetic_dump(dump, size_mb=0.2)
+    output_dir = os.path.join(tmp_path, 'salida')
+    os.makedirs(output_dir)
+    migrator = WordPressMigrator(dump, output_dir, bulk_load=True, verbose=False)
+    assert migrator.run_migration()
+    
+    results = migrator.compare_bulk_load()
+    assert set(results) >= {'wp_posts', 'wp_postmeta', 'wp_users', 'wp_usermeta'}
+    for table, (sql_rows, tsv_rows, differing) in results.items():
+        assert sql_rows == tsv_rows > 0, table
+        assert differing == 0, table
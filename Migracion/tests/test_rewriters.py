@@ -0,0 +1,155 @@
+import pytest
+
+from migration_processor_FINAL import (
+    URL_RULES, MultiRewriter, MojibakeRepairer, PhpSerializedRewriter,
+    php_serialized_valid, sql_escape, sql_unescape
+)
+
+
+def php(text):
+    """Cadena serializada por PHP (longitud en bytes UTF-8)"""
+    return f's:{len(text.encode("utf-8"))}:"{text}";'
+
+
+def serialized_strings(value):
+    """Reescribe y devuelve (resultado sin escapar, contadores) de un serializado escapado"""
+    rewriter = PhpSerializedRewriter(MultiRewriter(URL_RULES))
+    result = sql_unescape(rewriter.rewrite(sql_escape(value)))
+    return result, rewriter.counts
+
+
+# MultiRewriter
+
+def test_overlapping_rules_longest_match_wins_with_hits_per_rule():
+    rewriter = MultiRewriter(URL_RULES)
+    text = ('<img src="https://radiodos.com/wp-content/uploads/a.jpg"> '
+            '<a href="http://radiodos.com/nota">nota</a> https://radiodos.com/')
+    assert rewriter.rewrite(text) == (
+        '<img src="https://radiodos.aurigital.com/wp-content/uploads/a.jpg"> '
+        '<a href="https://radiodos.aurigital.com/nota">nota</a> https://radiodos.aurigital.com/')
+    assert rewriter.counts == {'https://radiodos.com/wp-content/uploads/': 1,
+                               'http://radiodos.com/': 1,
+                               'https://radiodos.com/': 1}
+
+
+def test_single_pass_does_not_chain_rules():
+    rewriter = MultiRewriter([('a.example', 'b.example'), ('b.example', 'c.example')])
+    assert rewriter.rewrite('a.example b.example') == 'b.example c.example'
+
+
+def test_first_rule_wins_for_duplicate_keys():
+    rewriter = MultiRewriter([('x.com', 'uno'), ('x.com', 'dos')])
+    assert rewriter.rewrite('x.com') == 'uno'
+
+
+def test_add_rule_recompiles_once_on_next_use():
+    rewriter = MultiRewriter(URL_RULES)
+    pattern = rewriter.pattern
+    rewriter.add_rule('https://cdn.radiodos.com/', 'https://radiodos.aurigital.com/cdn/')
+    rewriter.add_rule('https://img.radiodos.com/', 'https://radiodos.aurigital.com/img/')
+    assert rewriter.compiled is None
+    assert rewriter.rewrite('https://cdn.radiodos.com/1 https://img.radiodos.com/2') == \
+        'https://radiodos.aurigital.com/cdn/1 https://radiodos.aurigital.com/img/2'
+    assert rewriter.pattern is not pattern
+    assert rewriter.pattern is rewriter.pattern
+
+
+def test_no_rules_leaves_text_alone():
+    assert MultiRewriter([]).rewrite('https://radiodos.com/') == 'https://radiodos.com/'
+
+
+# PhpSerializedRewriter
+
+def test_escaped_serialized_value_gets_new_lengths():
+    value = 'a:2:{' + php('file') + php('2023/01/a.jpg') + php('url') + php(
+        'https://radiodos.com/wp-content/uploads/2023/01/a.jpg') + '}'
+    escaped = sql_escape(value)
+    assert '\\"' in escaped
+    result, counts = serialized_strings(value)
+    assert result == 'a:2:{' + php('file') + php('2023/01/a.jpg') + php('url') + php(
+        'https://radiodos.aurigital.com/wp-content/uploads/2023/01/a.jpg') + '}'
+    assert counts == {'reserialized': 1, 'invalid': 0}
+
+
+def test_lengths_are_measured_on_unescaped_multibyte_text():
+    caption = 'Canción de "Radio Dos"\r\nO\'Higgins \\ 😀'
+    value = 'a:2:{' + php('caption') + php(caption) + php('url') + php('https://radiodos.com/a.jpg') + '}'
+    result, counts = serialized_strings(value)
+    assert php_serialized_valid(result)
+    assert php(caption) in result
+    assert php('https://radiodos.aurigital.com/a.jpg') in result
+    assert counts['invalid'] == 0
+
+
+def test_doubled_quote_escaping_from_phpmyadmin():
+    value = 'a:2:{' + php('alt') + php("it's") + php('url') + php('https://radiodos.com/x') + '}'
+    rewriter = PhpSerializedRewriter(MultiRewriter(URL_RULES))
+    result = sql_unescape(rewriter.rewrite(value.replace("'", "''")))
+    assert result == 'a:2:{' + php('alt') + php("it's") + php('url') + php('https://radiodos.aurigital.com/x') + '}'
+
+
+def test_double_serialized_value_rewrites_both_levels():
+    inner = 'a:1:{' + php('url') + php('https://radiodos.com/a.jpg') + '}'
+    value = 'a:1:{' + php('data') + php(inner) + '}'
+    result, counts = serialized_strings(value)
+    new_inner = 'a:1:{' + php('url') + php('https://radiodos.aurigital.com/a.jpg') + '}'
+    assert result == 'a:1:{' + php('data') + php(new_inner) + '}'
+    assert php_serialized_valid(result) and php_serialized_valid(new_inner)
+    assert counts['reserialized'] == 1
+
+
+def test_value_without_hits_is_returned_untouched_and_not_counted():
+    value = sql_escape('a:1:{' + php('url') + php('https://otro.example/a.jpg') + '}')
+    rewriter = PhpSerializedRewriter(MultiRewriter(URL_RULES))
+    assert rewriter.rewrite(value) is value
+    assert rewriter.counts == {'reserialized': 0, 'invalid': 0}
+
+
+def test_broken_source_lengths_fall_back_to_plain_replace():
+    value = sql_escape('a:1:{s:99:"https://radiodos.com/a.jpg";}')
+    rewriter = PhpSerializedRewriter(MultiRewriter(URL_RULES))
+    assert 'radiodos.aurigital.com' in rewriter.rewrite(value)
+    assert rewriter.counts == {'reserialized': 0, 'invalid': 1}
+
+
+def test_plain_values_get_plain_replace():
+    rewriter = PhpSerializedRewriter(MultiRewriter(URL_RULES))
+    assert rewriter.rewrite('https://radiodos.com/x') == 'https://radiodos.aurigital.com/x'
+
+
+# MojibakeRepairer
+
+@pytest.mark.parametrize('text, expected', [
+    ('canciÃ³n', 'canción'),
+    ('MÃ‰XICO Â¡YA!', 'MÉXICO ¡YA!'),
+    ('â€œHolaâ€™ â€“ fin', '“Hola’ – fin'),
+    ('canciÃƒÂ³n', 'canción'),
+    ('ðŸ˜€', '😀'),
+    ('ï»¿x', '﻿x'),
+])
+def test_mojibake_is_repaired(text, expected):
+    assert MojibakeRepairer().rewrite(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    '«YA PASÓ»',
+    'AQUÍ¡',
+    'Nº 5, 20° y ÉL»',
+    'SÃO PAULO',
+    'Âme',
+    'pâté',
+    'naïve',
+    'ðæt',
+    'Ã la carte',
+])
+def test_genuine_text_is_left_alone(text):
+    repairer = MojibakeRepairer()
+    assert repairer.rewrite(text) == text
+    assert repairer.counts == {}
+
+
+def test_serialized_usermeta_is_repaired_with_new_lengths():
+    repairer = PhpSerializedRewriter(MojibakeRepairer())
+    value = 'a:1:{' + php('name') + php('JosÃ© "Pepe"') + '}'
+    result = sql_unescape(repairer.rewrite(sql_escape(value)))
+    assert result == 'a:1:{' + php('name') + php('José "Pepe"') + '}'
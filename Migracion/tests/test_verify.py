@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from migration_processor_FINAL import WordPressMigrator, generate_synthetic_dump
+
+
+@pytest.fixture
+def synthetic_dump(tmp_path):
+    dump = os.path.join(tmp_path, 'synthetic.sql')
+    rows = generate_synthetic_dump(dump, size_mb=0.1)['rows']
+    return dump, rows
+
+
+def migrate(tmp_path, dump, **options):
+    output_dir = os.path.join(tmp_path, 'salida')
+    os.makedirs(output_dir, exist_ok=True)
+    migrator = WordPressMigrator(dump, output_dir, verbose=False, **options)
+    assert migrator.run_migration()
+    return migrator
+
+
+def test_source_counts_match_synthetic_dump(tmp_path, synthetic_dump):
+    dump, rows = synthetic_dump
+    # Cada grupo del dump sintético: post, revisión, attachment y un elemento de otro tipo
+    units = rows['wp_posts'] // 4
+    source = migrate(tmp_path, dump).count_source_dump()
+
+    assert source['posts'] == source['attachments'] == units
+    assert sum(source['other_types'].values()) == 2 * units
+    assert source['posts_by_status'] == {'publish': units}
+    assert sum(source['authors'].values()) == units
+    assert source['thumbnails'] == units
+    assert source['terms'] == rows['wp_terms']
+    # Una taxonomía nav_menu no cuenta; sus relaciones (una por grupo) quedan fuera
+    assert source['taxonomies'] == rows['wp_term_taxonomy'] - 1
+    assert source['relationships'] == rows['wp_term_relationships'] == 3 * units
+    assert source['relationships_valid'] == source['relationships_migrated'] == 2 * units
+
+
+@pytest.mark.parametrize('options', [{}, {'prune': False}, {'bulk_load': True}])
+def test_verify_passes_against_independent_source_counts(tmp_path, synthetic_dump, options):
+    migrator = migrate(tmp_path, synthetic_dump[0], **options)
+    assert migrator.verify_output()
+
+
+def test_verify_explains_extraction_drops(tmp_path, synthetic_dump):
+    migrator = migrate(tmp_path, synthetic_dump[0])
+    source = migrator.count_source_dump()
+
+    assert sum(migrator.stats['skipped_post_types'].values()) == sum(source['other_types'].values())
+    assert (migrator.stats['pruned'].get('términos sin categoría/etiqueta migrada', 0)
+            == source['terms'] - source['terms_in_taxonomies'])
+
+
+def test_verify_fails_when_output_disagrees_with_source(tmp_path, synthetic_dump, monkeypatch):
+    migrator = migrate(tmp_path, synthetic_dump[0])
+    source = migrator.count_source_dump()
+    source['posts'] += 1
+    monkeypatch.setattr(migrator, 'count_source_dump', lambda: source)
+    assert not migrator.verify_output()